@@ -0,0 +1,64 @@
+from typing import Dict, List, Tuple
+
+from imgflw.entities import Image, Rect
+from imgflw.usecase import FaceDetector
+from imgflw.usecase import component_registry as registry
+from imgflw.usecase import detection_util
+
+
+class CascadeDetector(FaceDetector):
+    def name(self) -> str:
+        return "Cascade"
+
+    def detect(
+        self,
+        image: Image,
+        proposer: str = "RetinaFace",
+        verifier: str = "RetinaFace",
+        proposer_params: Dict = {},
+        verifier_params: Dict = {},
+        proposal_side: int = 640,
+        padding: float = 0.5,
+        fallback: bool = False,
+        face_fusion_iou: float = 0.5,
+        **kwargs,
+    ) -> List[Rect]:
+        if self.name().lower() in {proposer.lower(), verifier.lower()}:
+            raise ValueError(f"{self.name()} cannot be used as its own proposer or verifier")
+
+        params = {**kwargs, "max_detection_side": proposal_side, **(proposer_params or {})}
+        proposals = registry.get_face_detector(proposer).detect(image, **params)
+
+        params = {**kwargs, **(verifier_params or {})}
+        if len(proposals) == 0:
+            return registry.get_face_detector(verifier).detect(image, **params) if fallback else []
+
+        regions = self.__merge_regions([detection_util.pad(p, padding, image.width, image.height) for p in proposals])
+        crops = [Image(image.array[top:bottom, left:right]) for left, top, right, bottom in regions]
+        detected = registry.get_face_detector(verifier).detect_batch(crops, **params)
+
+        faces = []
+        for (left, top, _, _), crop_faces in zip(regions, detected):
+            faces.extend(face.translate(left, top) for face in crop_faces)
+        return detection_util.fuse(faces, face_fusion_iou)
+
+    def __merge_regions(self, regions: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+        merged: List[Tuple[int, int, int, int]] = []
+        for region in regions:
+            while True:
+                overlapping = [m for m in merged if self.__overlaps(m, region)]
+                if len(overlapping) == 0:
+                    break
+                for m in overlapping:
+                    merged.remove(m)
+                    region = (
+                        min(region[0], m[0]),
+                        min(region[1], m[1]),
+                        max(region[2], m[2]),
+                        max(region[3], m[3]),
+                    )
+            merged.append(region)
+        return merged
+
+    def __overlaps(self, a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+        return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
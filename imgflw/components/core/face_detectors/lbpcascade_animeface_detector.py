@@ -1,25 +1,55 @@
 import os
+import threading
 from typing import List, Sequence
 
 import cv2
 
 from imgflw.entities import Image, Rect
-from imgflw.usecase import FaceDetector
+from imgflw.usecase import FaceDetector, detection_util
 
 
 class LbpcascadeAnimefaceDetector(FaceDetector):
     def __init__(self) -> None:
         self.cascade_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lbpcascade_animeface.xml")
+        self.__local = threading.local()
 
     def name(self):
         return "lbpcascade_animeface"
 
-    def detect(self, image: Image, min_neighbors: int = 5, **kwargs) -> List[Rect]:
-        cascade = cv2.CascadeClassifier(self.cascade_file)
+    def detect(
+        self,
+        image: Image,
+        min_neighbors: int = 5,
+        max_detection_side: int = 0,
+        refine_detection: bool = False,
+        pyramid_side: int = 0,
+        **kwargs,
+    ) -> List[Rect]:
+        return detection_util.detect(
+            image, lambda img: self.__detect(img, min_neighbors, pyramid_side), max_detection_side, refine_detection
+        )
+
+    def __detect(self, image: Image, min_neighbors: int, pyramid_side: int) -> List[Rect]:
         gray = cv2.cvtColor(image.array, cv2.COLOR_RGB2GRAY)
+        height, width = gray.shape[:2]
+        if pyramid_side > 0:
+            while max(gray.shape[:2]) > pyramid_side:
+                gray = cv2.pyrDown(gray)
         gray = cv2.equalizeHist(gray)
-        xywhs = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=min_neighbors, minSize=(24, 24))
-        return self.__xywh_to_ltrb(xywhs)
+        xywhs = self.__get_cascade().detectMultiScale(
+            gray, scaleFactor=1.1, minNeighbors=min_neighbors, minSize=(24, 24)
+        )
+        faces = self.__xywh_to_ltrb(xywhs)
+        if gray.shape[1] != width:
+            faces = [face.scale(width / gray.shape[1]) for face in faces]
+        return faces
+
+    def __get_cascade(self) -> cv2.CascadeClassifier:
+        cascade = getattr(self.__local, "cascade", None)
+        if cascade is None:
+            cascade = cv2.CascadeClassifier(self.cascade_file)
+            self.__local.cascade = cascade
+        return cascade
 
     def __xywh_to_ltrb(self, xywhs: Sequence) -> List[Rect]:
         ltrbs = []
@@ -1,10 +1,11 @@
+import threading
 from typing import List
 
 import torch
 from facexlib.detection import init_detection_model, retinaface
 
 from imgflw.entities import Image, Landmarks, Point, Rect
-from imgflw.usecase import FaceDetector, Settings
+from imgflw.usecase import FaceDetector, Settings, detection_util
 
 
 class RetinafaceDetector(FaceDetector):
@@ -12,13 +13,27 @@ class RetinafaceDetector(FaceDetector):
         if hasattr(retinaface, "device"):
             retinaface.device = Settings.device
         self.detection_model = None
+        self.__lock = threading.Lock()
 
     def name(self):
         return "RetinaFace"
 
-    def detect(self, image: Image, confidence: float = 0.9, **kwargs) -> List[Rect]:
-        if self.detection_model is None:
-            self.detection_model = init_detection_model("retinaface_resnet50", device=Settings.device)
+    def detect(
+        self,
+        image: Image,
+        confidence: float = 0.9,
+        max_detection_side: int = 0,
+        refine_detection: bool = False,
+        **kwargs,
+    ) -> List[Rect]:
+        return detection_util.detect(
+            image, lambda img: self.__detect(img, confidence), max_detection_side, refine_detection
+        )
+
+    def __detect(self, image: Image, confidence: float) -> List[Rect]:
+        with self.__lock:
+            if self.detection_model is None:
+                self.detection_model = init_detection_model("retinaface_resnet50", device=Settings.device)
 
         with torch.no_grad():
             boxes_landmarks = self.detection_model.detect_faces(image.array, confidence)
@@ -1,8 +1,7 @@
 from typing import List
 
-from PIL import ImageFilter
-
 from imgflw.entities import DebugImage, Face, Image
+from imgflw.imaging import blur
 from imgflw.usecase import FaceProcessor
 
 
@@ -11,6 +10,6 @@ class BlurProcessor(FaceProcessor):
         return "Blur"
 
     def process(self, face: Face, intermediate_steps: List[DebugImage], radius: float = 20, **kwargs) -> None:
-        face.face_image = Image(face.face_image.pil_image.filter(ImageFilter.GaussianBlur(radius)))
+        face.face_image = Image(blur.gaussian_blur(face.face_image.array, radius))
         if intermediate_steps is not None:
             intermediate_steps.append(DebugImage(face.face_image, bottom_message=f"Radius: {radius}"))
@@ -1,9 +1,9 @@
 from typing import List
 
 from imgflw.components.core.frame_editors.img2img_tool import Img2ImgTool
-from imgflw.entities import DebugImage, Face, default
+from imgflw.entities import DebugImage, Face, ModelProfile, default
 from imgflw.usecase import FaceProcessor
-from imgflw.usecase.image_processing_util import resize, rotate
+from imgflw.usecase.image_processing_util import align, resize, warp
 
 
 class Img2ImgFaceProcessor(FaceProcessor):
@@ -23,13 +23,15 @@ class Img2ImgFaceProcessor(FaceProcessor):
         prompt: str = "",
         negative_prompt: str = "",
         strength: float = 0.4,
-        img2img_size: int = default.IMG2IMG_SIZE,
+        img2img_size: int = None,
         seed: int = 2,
-        steps: int = 20,
+        steps: int = None,
+        guidance_scale: float = None,
         ignore_larger_faces=False,
         upscaler: str = default.UPSCALER,
         **kwargs,
     ) -> None:
+        img2img_size = img2img_size or ModelProfile.get(model).size
         if ignore_larger_faces and face.width > img2img_size:
             message = f"ignore larger face:\n {face.width}x{face.height} > {img2img_size}x{img2img_size}"
             print(message, flush=True)
@@ -40,15 +42,14 @@ class Img2ImgFaceProcessor(FaceProcessor):
         pp = pp or prompt
         np = np or negative_prompt
 
-        angle = face.get_angle()
-        new_image = rotate(face.face_image, angle)
-        new_image = resize(new_image, img2img_size, upscaler=upscaler)
+        angle = face.artifacts.get("angle", face.get_angle)
+        aligned, inverse = align(face.face_image, angle, img2img_size, upscaler=upscaler)
 
-        new_image = self.__img2img_tool.img2img(model, new_image, None, pp, np, strength, seed, steps)
+        new_image = self.__img2img_tool.img2img(model, aligned, None, pp, np, strength, seed, steps, guidance_scale)
+        if new_image.width != aligned.width or new_image.height != aligned.height:
+            new_image = resize(new_image, aligned.width, aligned.height)
 
-        new_image = resize(new_image, face.width)
-        new_image = rotate(new_image, -angle)
-        face.face_image = new_image
+        face.face_image = warp(new_image, inverse, face.width, face.height)
 
         if intermediate_steps is not None:
             intermediate_steps.append(
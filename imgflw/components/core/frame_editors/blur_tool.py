@@ -1,9 +1,8 @@
 from typing import List, Tuple
 
-from PIL import ImageFilter
-
 from imgflw.entities import DebugImage, Image, Rect
-from imgflw.usecase import FrameEditor
+from imgflw.imaging import blur
+from imgflw.usecase import FrameEditor, concurrency
 
 
 class BlurTool(FrameEditor):
@@ -19,7 +18,11 @@ class BlurTool(FrameEditor):
         radius: float = 2,
         **kwargs,
     ) -> Tuple[Image, Image]:
-        image = Image(image.pil_image.filter(ImageFilter.GaussianBlur(radius)))
+        image = Image(
+            blur.gaussian_blur(
+                image.array, radius, tiles=concurrency.max_workers(), map_fn=concurrency.run_concurrently
+            )
+        )
 
         if intermediate_steps is not None:
             intermediate_steps.append(DebugImage(image, bottom_message=f"Radius: {radius}"))
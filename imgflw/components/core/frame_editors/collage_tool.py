@@ -3,7 +3,8 @@ from typing import Dict, List, Tuple
 import numpy as np
 
 from imgflw.components.core.frame_editors.crop_tool import CropTool
-from imgflw.entities import DebugImage, Image, Rect
+from imgflw.entities import DebugImage, Image, MaskImage, Rect
+from imgflw.imaging import compositing
 from imgflw.usecase import FrameEditor
 
 
@@ -53,25 +54,36 @@ class CollageTool(FrameEditor):
         return new_frame, new_mask
 
     def __concat_images(self, images: List[Tuple[Image, Image, Rect]], margin: int) -> (Image, Image):
-        new_frame = images[0][0]
-        new_mask = images[0][1]
-        for image, mask, _ in images[1:]:
-            new_frame = self.__concat_image(new_frame, image, margin)
-            if new_mask is not None:
-                new_mask = self.__concat_image(new_mask, mask, margin)
-        return new_frame, new_mask
+        if len(images) == 1:
+            return images[0][0], images[0][1]
 
-    def __concat_image(self, frame: Image, image: Image, overlap_width: int) -> Image:
-        new_frame = frame.array.copy()
-        new_image = image.array.copy()
+        frames = [image for image, _, _ in images]
+        masks = [mask for _, mask, _ in images]
+        height = max(frame.height for frame in frames)
+        lefts = [0]
+        for frame in frames[:-1]:
+            lefts.append(lefts[-1] + frame.width - min(margin, frame.width))
+        width = lefts[-1] + frames[-1].width
 
-        pad_height = new_frame.shape[0] - new_image.shape[0]
-        if pad_height > 0:
-            pad_before = pad_height // 2
-            pad_after = pad_height - pad_before
-            new_image = np.pad(new_image, ((pad_before, pad_after), (0, 0), (0, 0)), mode="constant")
+        new_frame = self.__assemble([frame.array for frame in frames], lefts, width, height, margin)
+        if any(mask is None for mask in masks):
+            new_mask = None
+        elif all(isinstance(mask, MaskImage) and mask.empty for mask in masks):
+            new_mask = MaskImage(width, height)
+        else:
+            new_mask = self.__assemble([mask.array for mask in masks], lefts, width, height, margin)
+        return new_frame, new_mask
 
-        alpha = np.linspace(1, 0, overlap_width).reshape(1, -1, 1)
-        blended = alpha * new_frame[:, -overlap_width:] + (1 - alpha) * new_image[:, :overlap_width]
-        new_frame = np.concatenate((new_frame[:, :-overlap_width], blended, new_image[:, overlap_width:]), axis=1)
-        return Image(new_frame.astype(np.uint8))
+    def __assemble(self, arrays: List[np.ndarray], lefts: List[int], width: int, height: int, margin: int) -> Image:
+        canvas = np.zeros((height, width) + arrays[0].shape[2:], dtype=np.uint8)
+        for i, (array, left) in enumerate(zip(arrays, lefts)):
+            top = (height - array.shape[0]) // 2
+            overlap_width = min(margin, array.shape[1]) if i > 0 else 0
+            if overlap_width > 0:
+                head = np.zeros((height, overlap_width) + array.shape[2:], dtype=np.uint8)
+                head[top : top + array.shape[0]] = array[:, :overlap_width]
+                alpha = np.round(np.linspace(255, 0, overlap_width)).astype(np.uint8).reshape(1, -1)
+                seam = canvas[:, left : left + overlap_width]
+                compositing.blend(seam, head, alpha, out=seam)
+            canvas[top : top + array.shape[0], left + overlap_width : left + array.shape[1]] = array[:, overlap_width:]
+        return Image(canvas)
@@ -1,8 +1,9 @@
 from typing import List, Tuple
 
-from PIL import ImageEnhance
+import numpy as np
 
 from imgflw.entities import DebugImage, Image, Rect
+from imgflw.imaging.color import ColorTransform
 from imgflw.usecase import FrameEditor
 
 
@@ -19,10 +20,28 @@ class ContrastTool(FrameEditor):
         contrast: float = 1.0,
         **kwargs,
     ) -> Tuple[Image, Image]:
-        enhancer = ImageEnhance.Contrast(image.pil_image)
-        img_contrasted = Image(enhancer.enhance(contrast))
+        return self.__adjust(image, mask_image, intermediate_steps, None, contrast)
+
+    def edit_in_place(
+        self,
+        image: Image,
+        mask_image: Image,
+        faces: List[Rect],
+        intermediate_steps: List[DebugImage],
+        contrast: float = 1.0,
+        **kwargs,
+    ) -> Tuple[Image, Image]:
+        return self.__adjust(image, mask_image, intermediate_steps, image.mutable_array, contrast)
+
+    def __adjust(
+        self, image: Image, mask_image: Image, intermediate_steps: List[DebugImage], out: np.ndarray, contrast: float
+    ) -> Tuple[Image, Image]:
+        img_contrasted = Image(self.get_color_transform(contrast).apply(image.array, out=out))
 
         if intermediate_steps is not None:
             intermediate_steps.append(DebugImage(img_contrasted, bottom_message=f"Contrast: {contrast}"))
 
         return img_contrasted, mask_image
+
+    def get_color_transform(self, contrast: float = 1.0, **kwargs) -> ColorTransform:
+        return ColorTransform.contrast(contrast)
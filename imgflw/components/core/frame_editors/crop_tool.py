@@ -65,12 +65,12 @@ class CropTool(FrameEditor):
         if len(target_faces) == 0:
             return image, mask_image, None
 
-        overlay = frame.array.copy()
-        output_image = frame.array.copy()
+        debug = intermediate_steps is not None and not dry_run
+        overlay = frame.array.copy() if debug else None
 
         face_areas = self.__get_area(target_faces, frame)
         rect = self.__add_margin(face_areas, margin, frame)
-        if not dry_run:
+        if debug:
             self.__rectangle(overlay, rect, (0, 255, 0), -1)
             self.__rectangle(overlay, face_areas, (255, 0, 0), 10)
 
@@ -94,15 +94,15 @@ class CropTool(FrameEditor):
         if bottom - top > 0:
             rect = Rect(rect.left, top, rect.right, bottom)
 
-        self.__rectangle(overlay, rect, (0, 255, 255), 10)
-        image = Image(frame.pil_image.crop(rect.to_tuple()))
-        mask_image = Image(mask_image.pil_image.crop(rect.to_tuple()))
+        image = frame.crop(rect.to_tuple())
+        mask_image = mask_image.crop(rect.to_tuple())
 
-        if intermediate_steps is not None:
-            mask = np.zeros_like(output_image)
+        if debug:
+            self.__rectangle(overlay, rect, (0, 255, 255), 10)
+            mask = np.zeros_like(frame.array)
             self.__rectangle(mask, rect, (255, 255, 255), -1)
-            cropped_image = cv2.bitwise_and(output_image, mask)
-            output_image = cv2.addWeighted(output_image, 0.3, cropped_image, 0.7, 0)
+            cropped_image = cv2.bitwise_and(frame.array, mask)
+            output_image = cv2.addWeighted(frame.array, 0.3, cropped_image, 0.7, 0)
             output_image = cv2.addWeighted(output_image, 0.7, overlay, 0.3, 0)
             mode_text = (
                 f"{mode} {condition.criteria if condition.criteria else ''} {condition.tag if condition.tag else ''}"
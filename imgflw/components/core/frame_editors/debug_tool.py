@@ -1,7 +1,6 @@
 from typing import List, Tuple
 
 import cv2
-import numpy as np
 
 from imgflw.entities import DebugImage, Image, Rect
 from imgflw.usecase import FrameEditor
@@ -17,8 +16,7 @@ class DebugTool(FrameEditor):
         if intermediate_steps is None:
             return image, mask_image
 
-        image: np.ndarray = image.copy().array
-        overlay = image.copy()
+        overlay = image.array.copy()
         color = (0, 0, 0)
         alpha = 0.3
 
@@ -28,7 +26,7 @@ class DebugTool(FrameEditor):
                 for landmark in face.landmarks:
                     cv2.circle(overlay, (int(landmark.x), int(landmark.y)), 6, color, 4)
 
-        output = Image(cv2.addWeighted(image, 1 - alpha, overlay, alpha, 0))
+        output = Image(cv2.addWeighted(image.array, 1 - alpha, overlay, alpha, 0))
         message = f"Faces: {len(faces)}" if len(faces) > 0 else "No faces detected"
         intermediate_steps.append(DebugImage(output, bottom_message=message))
         print(message, flush=True)
@@ -1,9 +1,9 @@
 from typing import List, Tuple
 
-import cv2
 import numpy as np
 
 from imgflw.entities import DebugImage, Image, Rect
+from imgflw.imaging.color import ColorTransform
 from imgflw.usecase import FrameEditor
 
 
@@ -22,18 +22,40 @@ class HslTool(FrameEditor):
         lightness: float = 1.0,
         **kwargs,
     ) -> Tuple[Image, Image]:
-        img = cv2.cvtColor(image.array.copy(), cv2.COLOR_RGB2HLS)
-        hue_adjust = hue / 360
-        hv, lv, sv = cv2.split(img)
+        return self.__adjust(image, mask_image, intermediate_steps, None, hue, saturation, lightness)
 
-        hv = np.mod(hv + hue_adjust * 180, 180).astype(np.uint8)
-        sv = np.clip(sv * saturation, 0, 255).astype(np.uint8)
-        lv = np.clip(lv * lightness, 0, 255).astype(np.uint8)
+    def edit_in_place(
+        self,
+        image: Image,
+        mask_image: Image,
+        faces: List[Rect],
+        intermediate_steps: List[DebugImage],
+        hue: int = 0,
+        saturation: float = 1.0,
+        lightness: float = 1.0,
+        **kwargs,
+    ) -> Tuple[Image, Image]:
+        return self.__adjust(image, mask_image, intermediate_steps, image.mutable_array, hue, saturation, lightness)
 
-        adjusted_img = cv2.cvtColor(cv2.merge([hv, lv, sv]), cv2.COLOR_HLS2RGB)
-        image = Image(adjusted_img)
+    def __adjust(
+        self,
+        image: Image,
+        mask_image: Image,
+        intermediate_steps: List[DebugImage],
+        out: np.ndarray,
+        hue: int,
+        saturation: float,
+        lightness: float,
+    ) -> Tuple[Image, Image]:
+        transform = self.get_color_transform(hue, saturation, lightness)
+        image = Image(transform.apply(image.array, out=out))
 
         if intermediate_steps is not None:
             intermediate_steps.append(DebugImage(image, bottom_message=f"H: {hue}, S: {saturation}, L: {lightness}"))
 
         return image, mask_image
+
+    def get_color_transform(
+        self, hue: int = 0, saturation: float = 1.0, lightness: float = 1.0, **kwargs
+    ) -> ColorTransform:
+        return ColorTransform.hls(hue, lightness, saturation)
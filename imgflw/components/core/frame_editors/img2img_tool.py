@@ -1,10 +1,15 @@
 import math
+import threading
 from typing import List, Tuple
 
+import diffusers
+import numpy
 import torch
 from diffusers import AutoPipelineForImage2Image
 
-from imgflw.entities import DebugImage, Image, Rect, default
+from imgflw.entities import DebugImage, Image, ModelProfile, Rect, default
+from imgflw.imaging import compositing
+from imgflw.imaging.compositing import to_gray_mask
 from imgflw.usecase import FrameEditor, Settings
 from imgflw.usecase.image_processing_util import resize
 from imgflw.usecase.mask_generator import MaskGenerator
@@ -14,6 +19,7 @@ class Img2ImgTool(FrameEditor):
     def __init__(self):
         self.__pipeline: AutoPipelineForImage2Image = None
         self.__model: str = None
+        self.__lock = threading.Lock()
 
     def name(self) -> str:
         return "img2img"
@@ -31,10 +37,13 @@ class Img2ImgTool(FrameEditor):
         negative_prompt: str = "",
         strength: float = 0.3,
         no_mask: bool = False,
-        img2img_size: int = default.IMG2IMG_SIZE,
+        img2img_size: int = None,
         seed: int = 2,
-        steps: int = 20,
+        steps: int = None,
+        guidance_scale: float = None,
         upscaler: str = default.UPSCALER,
+        tiled: bool = False,
+        tile_overlap: int = 64,
         **kwargs,
     ) -> Tuple[Image, Image]:
         if strength == 0:
@@ -42,6 +51,18 @@ class Img2ImgTool(FrameEditor):
 
         pp = pp or prompt
         np = np or negative_prompt
+        img2img_size = img2img_size or ModelProfile.get(model).size
+
+        if tiled and (image.width > img2img_size or image.height > img2img_size):
+            mask = mask_image if not no_mask else None
+            image = self.__tiled_img2img(
+                model, image, mask, pp, np, strength, seed, steps, guidance_scale, img2img_size, tile_overlap
+            )
+            if intermediate_steps is not None:
+                intermediate_steps.append(
+                    DebugImage(image, bottom_message=f"Prompt: {pp}", top_message=f"Strength: {strength}")
+                )
+            return image, mask_image
 
         if image.width < img2img_size and image.height < img2img_size:
             image = resize(image, img2img_size, upscaler=upscaler)
@@ -58,7 +79,7 @@ class Img2ImgTool(FrameEditor):
             mask_image = Image(mask_image.pil_image.crop((left, top, right, bottom)))
 
         mask = mask_image if not no_mask else None
-        image = self.img2img(model, image, mask, pp, np, strength, seed, steps)
+        image = self.img2img(model, image, mask, pp, np, strength, seed, steps, guidance_scale)
 
         if intermediate_steps is not None:
             masked_image = MaskGenerator.to_masked_image(mask_image.array, image.array)
@@ -70,33 +91,97 @@ class Img2ImgTool(FrameEditor):
         return image, mask_image
 
     def img2img(
-        self, model: str, image: Image, mask: Image, pp: str, np: str, strength: int, seed: int, steps: int
+        self,
+        model: str,
+        image: Image,
+        mask: Image,
+        pp: str,
+        np: str,
+        strength: float,
+        seed: int,
+        steps: int = None,
+        guidance_scale: float = None,
     ) -> Image:
+        profile = ModelProfile.get(model)
+        steps = steps or profile.steps
+        guidance_scale = guidance_scale if guidance_scale is not None else profile.guidance_scale
         if steps * strength < 1:
             steps = math.ceil(1 / strength)
 
-        pipeline = self.__get_pipeline(model)
-        generator = torch.Generator(Settings.device).manual_seed(seed)
-        new_image = pipeline(
-            pp,
-            negative_prompt=np,
-            image=image.pil_image,
-            num_inference_steps=steps,
-            strength=strength,
-            guidance_scale=0.7,
-            generator=generator,
-        ).images[0]
+        with self.__lock:
+            pipeline = self.__get_pipeline(model)
+            generator = torch.Generator(Settings.device).manual_seed(seed)
+            new_image = pipeline(
+                pp,
+                negative_prompt=np,
+                image=image.pil_image,
+                num_inference_steps=steps,
+                strength=strength,
+                guidance_scale=guidance_scale,
+                generator=generator,
+            ).images[0]
 
         if mask is None:
             return Image(new_image)
 
-        mask = mask.array
-        original = image.array
-        generated = Image(new_image).array
+        return Image(compositing.blend(image.array, Image(new_image).array, mask.array))
 
-        foreground = (original * (mask / 255.0)).astype("uint8")
-        background = (generated * (1 - (mask / 255.0))).astype("uint8")
-        return Image(foreground + background)
+    def __tiled_img2img(
+        self,
+        model: str,
+        image: Image,
+        mask: Image,
+        pp: str,
+        np: str,
+        strength: float,
+        seed: int,
+        steps: int,
+        guidance_scale: float,
+        tile_size: int,
+        overlap: int,
+    ) -> Image:
+        tile_width = min(tile_size, image.width) // 8 * 8
+        tile_height = min(tile_size, image.height) // 8 * 8
+        lefts = self.__get_tile_positions(image.width, tile_width, overlap)
+        tops = self.__get_tile_positions(image.height, tile_height, overlap)
+        output = image.array.copy()
+
+        for i, top in enumerate(tops):
+            for j, left in enumerate(lefts):
+                box = (left, top, left + tile_width, top + tile_height)
+                tile_mask = mask.crop(box) if mask is not None else None
+                if tile_mask is not None and to_gray_mask(tile_mask.array).min() == 255:
+                    continue
+
+                print(f"img2img tile: {box}", flush=True)
+                tile_seed = seed + i * len(lefts) + j
+                tile = self.img2img(
+                    model, image.crop(box), tile_mask, pp, np, strength, tile_seed, steps, guidance_scale
+                )
+
+                left_overlap = lefts[j - 1] + tile_width - left if j > 0 else 0
+                top_overlap = tops[i - 1] + tile_height - top if i > 0 else 0
+                feather = self.__get_feather(tile_width, tile_height, left_overlap, top_overlap)
+                roi = output[top : top + tile_height, left : left + tile_width]
+                compositing.blend(tile.array, roi, feather, out=roi)
+
+        return Image(output)
+
+    def __get_tile_positions(self, length: int, tile: int, overlap: int) -> List[int]:
+        if length <= tile:
+            return [0]
+        count = math.ceil((length - tile) / max(tile - overlap, 1)) + 1
+        return [round(i * (length - tile) / (count - 1)) for i in range(count)]
+
+    def __get_feather(self, width: int, height: int, left_overlap: int, top_overlap: int) -> numpy.ndarray:
+        feather = numpy.full((height, width), 255, dtype=numpy.uint8)
+        if left_overlap > 0:
+            ramp = numpy.linspace(0, 255, left_overlap, dtype=numpy.float32).astype(numpy.uint8)
+            numpy.minimum(feather[:, :left_overlap], ramp[numpy.newaxis, :], out=feather[:, :left_overlap])
+        if top_overlap > 0:
+            ramp = numpy.linspace(0, 255, top_overlap, dtype=numpy.float32).astype(numpy.uint8)
+            numpy.minimum(feather[:top_overlap, :], ramp[:, numpy.newaxis], out=feather[:top_overlap, :])
+        return feather
 
     def __get_pipeline(self, model: str) -> AutoPipelineForImage2Image:
         if self.__pipeline is None or self.__model != model:
@@ -106,7 +191,42 @@ class Img2ImgTool(FrameEditor):
         return self.__pipeline
 
     def __create_pipeline(self, model: str) -> AutoPipelineForImage2Image:
-        pipeline = AutoPipelineForImage2Image.from_pretrained(model, torch_dtype=torch.float16, variant="fp16")
+        profile = ModelProfile.get(model)
+        if Settings.device.type == "cpu":
+            return self.__create_cpu_pipeline(model, profile)
+
+        dtype = getattr(torch, profile.dtype)
+        variant = "fp16" if dtype == torch.float16 else None
+        pipeline = AutoPipelineForImage2Image.from_pretrained(model, torch_dtype=dtype, variant=variant)
+        self.__configure_pipeline(pipeline, profile)
         pipeline.to(Settings.device)
         pipeline.enable_model_cpu_offload()
         return pipeline
+
+    def __create_cpu_pipeline(self, model: str, profile: ModelProfile) -> AutoPipelineForImage2Image:
+        threads = Settings.get("torch_threads", None)
+        if threads:
+            torch.set_num_threads(int(threads))
+
+        dtype = getattr(torch, Settings.get("cpu_dtype", None) or "float32")
+        pipeline = AutoPipelineForImage2Image.from_pretrained(model, torch_dtype=dtype)
+        self.__configure_pipeline(pipeline, profile)
+        pipeline.to(Settings.device)
+
+        for name in ["unet", "vae"]:
+            module = getattr(pipeline, name, None)
+            if module is not None:
+                module.to(memory_format=torch.channels_last)
+
+        if profile.size > default.IMG2IMG_SIZE:
+            pipeline.enable_attention_slicing()
+
+        if Settings.get("torch_compile", False) and getattr(pipeline, "unet", None) is not None:
+            pipeline.unet = torch.compile(pipeline.unet)
+        return pipeline
+
+    def __configure_pipeline(self, pipeline: AutoPipelineForImage2Image, profile: ModelProfile) -> None:
+        if profile.scheduler:
+            pipeline.scheduler = getattr(diffusers, profile.scheduler).from_config(pipeline.scheduler.config)
+        pipeline.vae.enable_slicing()
+        pipeline.vae.enable_tiling()
@@ -1,9 +1,9 @@
 from typing import List, Tuple
 
-import cv2
 import numpy as np
 
 from imgflw.entities import DebugImage, Image, Rect
+from imgflw.imaging.color import ColorTransform
 from imgflw.usecase import FrameEditor
 
 
@@ -22,15 +22,38 @@ class RgbTool(FrameEditor):
         blue: float = 1.0,
         **kwargs,
     ) -> Tuple[Image, Image]:
-        red_channel, green_channel, blue_channel = cv2.split(image.array.copy())
+        return self.__adjust(image, mask_image, intermediate_steps, None, red, green, blue)
 
-        red_channel = np.clip(red_channel * red, 0, 255).astype(np.uint8)
-        green_channel = np.clip(green_channel * green, 0, 255).astype(np.uint8)
-        blue_channel = np.clip(blue_channel * blue, 0, 255).astype(np.uint8)
+    def edit_in_place(
+        self,
+        image: Image,
+        mask_image: Image,
+        faces: List[Rect],
+        intermediate_steps: List[DebugImage],
+        red: float = 1.0,
+        green: float = 1.0,
+        blue: float = 1.0,
+        **kwargs,
+    ) -> Tuple[Image, Image]:
+        return self.__adjust(image, mask_image, intermediate_steps, image.mutable_array, red, green, blue)
 
-        image = Image(cv2.merge([red_channel, green_channel, blue_channel]))
+    def __adjust(
+        self,
+        image: Image,
+        mask_image: Image,
+        intermediate_steps: List[DebugImage],
+        out: np.ndarray,
+        red: float,
+        green: float,
+        blue: float,
+    ) -> Tuple[Image, Image]:
+        transform = self.get_color_transform(red, green, blue)
+        image = Image(transform.apply(image.array, out=out))
 
         if intermediate_steps is not None:
             intermediate_steps.append(DebugImage(image, bottom_message=f"R: {red}, G: {green}, B: {blue}"))
 
         return image, mask_image
+
+    def get_color_transform(self, red: float = 1.0, green: float = 1.0, blue: float = 1.0, **kwargs) -> ColorTransform:
+        return ColorTransform.rgb(red, green, blue)
@@ -1,4 +1,5 @@
-from typing import List
+import threading
+from typing import List, Tuple
 
 import cv2
 import numpy as np
@@ -9,17 +10,37 @@ from torchvision.transforms.functional import normalize
 
 from imgflw.components.core.mask_generators.vignette_mask_generator import VignetteMaskGenerator
 from imgflw.entities import DebugImage, Face, Image
+from imgflw.imaging import resampling
 from imgflw.usecase import MaskGenerator, Settings
 
 
 class BiSeNetMaskGenerator(MaskGenerator):
+    PARSING_SIZE = 512
+    PARSING_ARTIFACT = "bisenet.parsing"
+    MEMORY_PER_FACE_MB = 128
+
     def __init__(self):
         self.__fallback_mask_generator = VignetteMaskGenerator()
         self.__mask_model = None
+        self.__lock = threading.Lock()
 
     def name(self) -> str:
         return "BiSeNet"
 
+    def prepare(self, faces: List[Face], batch_parsing: bool = False, **kwargs) -> None:
+        faces = [face for face in faces if face.artifacts.get(self.PARSING_ARTIFACT) is None]
+        if not batch_parsing or len(faces) == 0:
+            return
+
+        memory = Settings.get("face_parsing_memory_mb", 1024)
+        batch_size = max(1, int(memory) // self.MEMORY_PER_FACE_MB)
+        size = (self.PARSING_SIZE, self.PARSING_SIZE)
+        for i in range(0, len(faces), batch_size):
+            batch = faces[i : i + batch_size]
+            parsings = self.__parse([face.face_image.array for face in batch], size)
+            for face, parsing in zip(batch, parsings):
+                face.artifacts.set(self.PARSING_ARTIFACT, parsing)
+
     def generate_mask(
         self,
         face: Face,
@@ -32,35 +53,16 @@ class BiSeNetMaskGenerator(MaskGenerator):
         use_convex_hull: bool = False,
         **kwargs,
     ) -> None:
-        face_image = face.face_image.array.copy()
-        face_image = face_image[:, :, ::-1]
-
-        h, w, _ = face_image.shape
+        h, w = face.face_image.array.shape[:2]
 
-        if w != 512 or h != 512:
-            rw = (int(w * (512 / w)) // 8) * 8
-            rh = (int(h * (512 / h)) // 8) * 8
-            face_image = cv2.resize(face_image, dsize=(rw, rh))
-
-        face_tensor = img2tensor(face_image.astype("float32") / 255.0, float32=True)
-        normalize(face_tensor, (0.5, 0.5, 0.5), (0.5, 0.5, 0.5), inplace=True)
-        face_tensor = torch.unsqueeze(face_tensor, 0).to(Settings.device)
-
-        if self.__mask_model is None:
-            self.__mask_model = init_parsing_model(device=Settings.device)
-
-        with torch.no_grad():
-            face_image = self.__mask_model(face_tensor)[0]
-
-        face_image = face_image.squeeze(0).cpu().numpy().argmax(0)
-        face_image = face_image.copy().astype(np.uint8)
+        face_image = face.artifacts.get(self.PARSING_ARTIFACT, lambda: self.__parse_face(face))
 
         mask = self.__to_mask(face_image, affected_areas, use_convex_hull)
         if mask_size > 0:
             mask = cv2.dilate(mask, np.ones((5, 5), np.uint8), iterations=mask_size)
 
-        if w != 512 or h != 512:
-            mask = cv2.resize(mask, dsize=(w, h))
+        if mask.shape[1] != w or mask.shape[0] != h:
+            mask = resampling.resize(mask, w, h, resampling.FAST)
 
         if mask_blur > 0:
             mask = cv2.blur(mask, (mask_blur, mask_blur))
@@ -78,31 +80,50 @@ class BiSeNetMaskGenerator(MaskGenerator):
         if intermediate_steps is not None:
             self.add_debug_image(face, intermediate_steps)
 
+    def __parse_face(self, face: Face) -> np.ndarray:
+        h, w = face.face_image.array.shape[:2]
+        size = (w, h)
+        if w != self.PARSING_SIZE or h != self.PARSING_SIZE:
+            rw = (int(w * (self.PARSING_SIZE / w)) // 8) * 8
+            rh = (int(h * (self.PARSING_SIZE / h)) // 8) * 8
+            size = (rw, rh)
+        return self.__parse([face.face_image.array], size)[0]
+
+    def __parse(self, face_images: List[np.ndarray], size: Tuple[int, int]) -> List[np.ndarray]:
+        tensors = []
+        for face_image in face_images:
+            face_image = face_image[:, :, ::-1]
+            if face_image.shape[1] != size[0] or face_image.shape[0] != size[1]:
+                face_image = resampling.resize(face_image, size[0], size[1], resampling.FAST)
+            face_tensor = img2tensor(face_image.astype("float32") / 255.0, float32=True)
+            normalize(face_tensor, (0.5, 0.5, 0.5), (0.5, 0.5, 0.5), inplace=True)
+            tensors.append(face_tensor)
+        face_tensor = torch.stack(tensors).to(Settings.device)
+
+        with self.__lock:
+            if self.__mask_model is None:
+                self.__mask_model = init_parsing_model(device=Settings.device)
+
+            with torch.no_grad():
+                parsings = self.__mask_model(face_tensor)[0]
+
+        parsings = parsings.cpu().numpy().argmax(1).astype(np.uint8)
+        return list(parsings)
+
     def __to_mask(self, face: np.ndarray, affected_areas: List[str], use_convex_hull: bool) -> np.ndarray:
-        keep_face = "Face" in affected_areas
-        keep_neck = "Neck" in affected_areas
-        keep_hair = "Hair" in affected_areas
-        keep_hat = "Hat" in affected_areas
-
-        mask = np.zeros((face.shape[0], face.shape[1], 3), dtype=np.uint8)
-        num_of_class = np.max(face)
-
-        points = []
-        for i in range(1, num_of_class + 1):
-            index = np.where(face == i)
-            if i < 14 and keep_face:
-                mask[index[0], index[1], :] = [255, 255, 255]
-                points.extend(zip(index[1], index[0]))
-            elif i == 14 and keep_neck:
-                mask[index[0], index[1], :] = [255, 255, 255]
-                points.extend(zip(index[1], index[0]))
-            elif i == 17 and keep_hair:
-                mask[index[0], index[1], :] = [255, 255, 255]
-                points.extend(zip(index[1], index[0]))
-            elif i == 18 and keep_hat:
-                mask[index[0], index[1], :] = [255, 255, 255]
-                points.extend(zip(index[1], index[0]))
-        if use_convex_hull and points:
-            points = cv2.convexHull(np.array(points, dtype=np.float32).reshape(-1, 1, 2))
-            cv2.fillConvexPoly(mask, np.int32(points), (255, 255, 255))
+        lut = np.zeros(256, dtype=np.uint8)
+        if "Face" in affected_areas:
+            lut[1:14] = 255
+        if "Neck" in affected_areas:
+            lut[14] = 255
+        if "Hair" in affected_areas:
+            lut[17] = 255
+        if "Hat" in affected_areas:
+            lut[18] = 255
+
+        mask = cv2.LUT(face, lut)
+        if use_convex_hull:
+            points = cv2.findNonZero(mask)
+            if points is not None:
+                cv2.fillConvexPoly(mask, cv2.convexHull(points), 255)
         return mask
@@ -17,7 +17,7 @@ class NoMaskGenerator(MaskGenerator):
         use_minimal_area: bool = False,
         **kwargs,
     ) -> None:
-        face.mask_image = Image(np.ones((face.height, face.width, 3), np.uint8) * 255)
+        face.mask_image = Image(np.full((face.height, face.width), 255, np.uint8))
         if use_minimal_area:
             face.mask_non_face_areas()
         if intermediate_steps is not None:
@@ -1,19 +1,27 @@
+from .canvas import Canvas
 from .config import Config
 from .debug_image import DebugImage
 from .face import Face
+from .face_artifacts import FaceArtifacts
 from .image import Image
+from .mask_image import MaskImage
+from .model_profile import ModelProfile
 from .rect import Landmarks, Point, Rect
 from .status import Status
 from .workflow import Condition, Job, Rule, Worker, Workflow
 
 __all__ = [
+    "Canvas",
     "Config",
     "Condition",
     "DebugImage",
     "Face",
+    "FaceArtifacts",
     "Image",
     "Job",
     "Landmarks",
+    "MaskImage",
+    "ModelProfile",
     "Point",
     "Rect",
     "Rule",
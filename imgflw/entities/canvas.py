@@ -0,0 +1,64 @@
+import threading
+from typing import List, Tuple
+
+import numpy as np
+
+from imgflw.imaging import compositing
+
+from .image import Image
+
+
+class Canvas:
+    def __init__(self, image: Image):
+        self.__image = image
+        self.__patches: List[Tuple[int, int, np.ndarray, np.ndarray]] = []
+        self.__lock = threading.RLock()
+
+    @property
+    def width(self) -> int:
+        return self.__image.width
+
+    @property
+    def height(self) -> int:
+        return self.__image.height
+
+    def add(self, left: int, top: int, image: np.ndarray, mask: np.ndarray) -> None:
+        with self.__lock:
+            self.__patches.append((left, top, image, mask))
+
+    def crop(self, box: Tuple[int, int, int, int]) -> Image:
+        with self.__lock:
+            count = 0
+            for i, patch in enumerate(self.__patches):
+                if self.__overlaps(patch, box):
+                    count = i + 1
+            self.__compose(count)
+            return self.__image.crop(box)
+
+    def flush(self) -> Image:
+        with self.__lock:
+            self.__compose(len(self.__patches))
+            return self.__image
+
+    def __compose(self, count: int) -> None:
+        if count == 0:
+            return
+
+        base = self.__image.mutable_array
+        for left, top, image, mask in self.__patches[:count]:
+            roi = base[top : top + image.shape[0], left : left + image.shape[1]]
+            if self.__is_same_view(image, roi):
+                continue
+            compositing.blend(image, roi, mask, out=roi)
+        del self.__patches[:count]
+
+    def __overlaps(self, patch: Tuple[int, int, np.ndarray, np.ndarray], box: Tuple[int, int, int, int]) -> bool:
+        left, top, image, _ = patch
+        return left < box[2] and box[0] < left + image.shape[1] and top < box[3] and box[1] < top + image.shape[0]
+
+    def __is_same_view(self, image: np.ndarray, roi: np.ndarray) -> bool:
+        return (
+            image.shape == roi.shape
+            and image.strides == roi.strides
+            and image.__array_interface__["data"][0] == roi.__array_interface__["data"][0]
+        )
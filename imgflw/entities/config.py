@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -7,7 +9,10 @@ class Config(BaseModel):
     negative_prompt: str = ""
     max_face_count: int = 20
     show_intermediate_steps: bool = True
-    img2img_size: int = 512
+    img2img_size: Optional[int] = None
     use_minimal_area: bool = False
     face_margin: float = 1.6
     seed: int = 2
+    max_detection_side: int = 0
+    face_fusion_iou: float = 0.5
+    concurrent_face_processing: bool = True
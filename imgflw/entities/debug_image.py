@@ -5,6 +5,7 @@ import numpy as np
 from PIL import Image as PILImage
 
 from imgflw.entities.image import Image
+from imgflw.imaging import resampling
 
 
 class DebugImage:
@@ -54,7 +55,7 @@ class DebugImage:
     def __resize(self, size: int) -> np.ndarray:
         height, width = self.image.shape[:2]
         if height == width:
-            return cv2.resize(self.image, dsize=(size, size))
+            return resampling.resize(self.image, size, size, resampling.FAST)
 
         aspect_ratio = width / height
 
@@ -65,7 +66,7 @@ class DebugImage:
             new_height = size
             new_width = int(size * aspect_ratio)
 
-        resized_image = cv2.resize(self.image, (new_width, new_height))
+        resized_image = resampling.resize(self.image, new_width, new_height, resampling.FAST)
         image = np.zeros((size, size, 3), dtype=np.uint8)
         y_offset = (size - new_height) // 2
         x_offset = (size - new_width) // 2
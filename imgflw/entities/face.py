@@ -1,31 +1,50 @@
 import traceback
-from typing import Tuple
+from typing import Tuple, Union
 
-import cv2
 import numpy as np
 
+from imgflw.imaging import compositing
+
+from .canvas import Canvas
+from .face_artifacts import FaceArtifacts
 from .image import Image
+from .mask_image import MaskImage
 from .rect import Point, Rect
 
 
 class Face:
-    def __init__(self, entire_image: Image, face_area: Rect, face_margin: float):
+    def __init__(
+        self,
+        entire_image: Union[Image, Canvas],
+        face_area: Rect,
+        face_margin: float,
+        artifacts: FaceArtifacts = None,
+    ):
         self.face_area = face_area
+        self.artifacts = artifacts if artifacts is not None else FaceArtifacts()
         self.center = face_area.center
-        left, top, right, bottom = face_area.to_square()
-
-        self.left, self.top, self.right, self.bottom = self.__ensure_margin(
-            left, top, right, bottom, entire_image, face_margin
+        self.left, self.top, self.right, self.bottom = self.get_box(
+            face_area, face_margin, entire_image.width, entire_image.height
         )
 
         self.width = self.right - self.left
         self.height = self.bottom - self.top
-        self.face_image = Image(entire_image.array[self.top : self.bottom, self.left : self.right, :])
+        self.face_image = entire_image.crop((self.left, self.top, self.right, self.bottom))
         self.face_area_on_face_image = self.__get_face_area_on_face_image()
-        self.landmarks_on_face_image = self.__get_landmarks_on_face_image()
+        self.landmarks_on_face_image = self.artifacts.get("landmarks_on_face_image", self.__get_landmarks_on_face_image)
         l, t, r, b = self.face_area_on_face_image
         self.face_area_total_pixels = (r - l) * (b - t)
-        self.mask_image = Image(np.ones((self.height, self.width, 3), np.uint8) * 255)
+        self.mask_image = Image(np.full((self.height, self.width), 255, np.uint8))
+
+    @property
+    def mask_image(self) -> Image:
+        return self.__mask_image
+
+    @mask_image.setter
+    def mask_image(self, mask_image: Image) -> None:
+        if mask_image.array.ndim != 2:
+            mask_image = Image(compositing.to_gray_mask(mask_image.array))
+        self.__mask_image = mask_image
 
     def __get_face_area_on_face_image(self):
         left = int((self.face_area.left - self.left))
@@ -46,11 +65,15 @@ class Face:
                 )
         return landmarks
 
+    @staticmethod
+    def get_box(face_area: Rect, face_margin: float, width: int, height: int) -> Tuple[int, int, int, int]:
+        left, top, right, bottom = face_area.to_square()
+        return Face.__ensure_margin(left, top, right, bottom, width, height, face_margin)
+
+    @staticmethod
     def __ensure_margin(
-        self, left: int, top: int, right: int, bottom: int, entire_image: Image, margin: float
+        left: int, top: int, right: int, bottom: int, entire_width: int, entire_height: int, margin: float
     ) -> Tuple[int, int, int, int]:
-        entire_height, entire_width = entire_image.array.shape[:2]
-
         side_length = right - left
         margin = min(min(entire_height, entire_width) / side_length, margin)
         diff = int((side_length * margin - side_length) / 2)
@@ -136,7 +159,7 @@ class Face:
         bottom = min(self.height, max(0, bottom))
         return left, top, right, bottom
 
-    def merge(self, entire_image: Image, entire_mask_image: Image, use_minimal_area: bool) -> (Image, Image):
+    def merge(self, canvas: Canvas, entire_mask_image: Image, use_minimal_area: bool) -> None:
         face_image = self.face_image.array
         mask_image = self.mask_image.array
 
@@ -150,14 +173,11 @@ class Face:
             face_image = face_image[top - self.top : bottom - self.top, left - self.left : right - self.left]
             mask_image = mask_image[top - self.top : bottom - self.top, left - self.left : right - self.left]
 
-        face_background = entire_image.array[top:bottom, left:right]
-        face_fg = (face_image * (mask_image / 255.0)).astype("uint8")
-        face_bg = (face_background * (1 - (mask_image / 255.0))).astype("uint8")
-        face_image = face_fg + face_bg
-
-        entire_image.array[top:bottom, left:right] = face_image
-        entire_mask_image.array[top:bottom, left:right] = mask_image
-        return Image(entire_image.array), Image(entire_mask_image.array)
+        canvas.add(left, top, face_image, mask_image)
+        if isinstance(entire_mask_image, MaskImage):
+            entire_mask_image.paste(left, top, mask_image)
+        else:
+            entire_mask_image.mutable_array[top:bottom, left:right] = mask_image
 
     def mask_non_face_areas(self) -> None:
         self.mask_image = Image(self.get_mask_non_face_areas())
@@ -174,6 +194,5 @@ class Face:
         return image
 
     def calculate_mask_coverage(self, mask: np.ndarray) -> float:
-        gray_mask = cv2.cvtColor(mask, cv2.COLOR_RGB2GRAY)
-        non_black_pixels = np.count_nonzero(gray_mask)
+        non_black_pixels = np.count_nonzero(compositing.to_gray_mask(mask))
         return non_black_pixels / self.face_area_total_pixels
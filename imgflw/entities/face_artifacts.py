@@ -0,0 +1,19 @@
+from typing import Any, Callable, Dict
+
+
+class FaceArtifacts:
+    def __init__(self) -> None:
+        self.__items: Dict[str, Any] = {}
+
+    def get(self, key: str, factory: Callable[[], Any] = None) -> Any:
+        if key not in self.__items:
+            if factory is None:
+                return None
+            self.__items[key] = factory()
+        return self.__items[key]
+
+    def set(self, key: str, value: Any) -> None:
+        self.__items[key] = value
+
+    def clear(self) -> None:
+        self.__items.clear()
@@ -1,16 +1,36 @@
-from typing import Union
+import os
+import threading
+from typing import Callable, Iterable, Tuple, Union
 
 import numpy as np
 from PIL import Image as PILImage
+from PIL import ImageOps
+
+from imgflw.imaging import resampling
 
 
 class Image:
-    def __init__(self, image: Union[np.ndarray, PILImage.Image, "Image"]):
+    def __init__(self, image: Union[np.ndarray, PILImage.Image, "Image", str, os.PathLike]):
         assert image is not None
-        if isinstance(image, Image):
+        self.__init_state()
+
+        if isinstance(image, Image) and type(image) is not Image:
             image = image.array
 
-        if isinstance(image, PILImage.Image):
+        if isinstance(image, Image):
+            self.__array = image.__array
+            self.__pil_image = image.__pil_image
+            self.__source = image.__source
+            self.__origin = image.__origin
+            self.__resize = image.__resize
+            self.__shared = image.__shared
+            if image.__array is not None:
+                self.__borrowed = image.__borrowed = True
+        elif isinstance(image, (str, os.PathLike)):
+            self.__array = None
+            self.__pil_image = self.__open(image)
+            self.__source = os.fspath(image)
+        elif isinstance(image, PILImage.Image):
             self.__array = None
             self.__pil_image = image
         else:
@@ -20,22 +40,144 @@ class Image:
     def copy(self) -> "Image":
         return Image(self.array.copy())
 
+    def crop(self, box: Tuple[int, int, int, int]) -> "Image":
+        left, top, right, bottom = box
+        if left < 0 or top < 0 or right > self.width or bottom > self.height:
+            return Image(self.pil_image.crop(box))
+
+        cropped = Image(self.array[top:bottom, left:right])
+        if self.__origin is None:
+            cropped.__origin = (self, box)
+        else:
+            origin, (x, y, _, _) = self.__origin
+            cropped.__origin = (origin, (x + left, y + top, x + right, y + bottom))
+        return cropped
+
+    def resize(
+        self,
+        width: int,
+        height: int,
+        quality: str = resampling.BEST,
+        tiles: int = 1,
+        map_fn: Callable[[Callable, Iterable], Iterable] = map,
+    ) -> "Image":
+        if width == self.width and height == self.height:
+            return self
+
+        source, box = self.__origin if self.__origin is not None else (self, (0, 0, self.width, self.height))
+        pending = self.__resize
+        if pending is not None:
+            source, box = pending[:2]
+
+        resized = Image.__new__(Image)
+        resized.__init_state()
+        resized.__resize = (source, box, (width, height), quality, tiles, map_fn)
+        return resized
+
     @property
     def array(self) -> np.ndarray:
         if self.__array is None:
-            self.__array = np.array(self.__pil_image, dtype=np.uint8)
+            with self.__lock:
+                if self.__array is None and self.__resize is not None:
+                    source, (left, top, right, bottom), (width, height), quality, tiles, map_fn = self.__resize
+                    array = source.array[top:bottom, left:right]
+                    self.__array = resampling.resize(array, width, height, quality, tiles, map_fn)
+                    self.__resize = None
+                elif self.__array is None:
+                    self.__array = np.asarray(self.__pil_image, dtype=np.uint8)
         return self.__array
 
+    @property
+    def mutable_array(self) -> np.ndarray:
+        with self.__lock:
+            array = self.array
+            if self.__borrowed or not array.flags.writeable:
+                array = array.copy()
+                self.__array = array
+                self.__origin = None
+                self.__shared = False
+                self.__borrowed = False
+            if not self.__shared:
+                self.__pil_image = None
+            self.__source = None
+            return array
+
     @property
     def pil_image(self) -> PILImage.Image:
         if self.__pil_image is None:
-            self.__pil_image = PILImage.fromarray(self.__array)
+            with self.__lock:
+                if self.__pil_image is None:
+                    array = self.array
+                    mode = self.__get_shared_mode(array)
+                    if mode is not None:
+                        height, width = array.shape[:2]
+                        self.__pil_image = PILImage.frombuffer(mode, (width, height), array, "raw", mode, 0, 1)
+                        self.__shared = True
+                    else:
+                        self.__pil_image = PILImage.fromarray(array)
         return self.__pil_image
 
     @property
     def width(self) -> int:
-        return self.array.shape[1] if self.array is not None else self.pil_image.width
+        pending = self.__resize
+        if pending is not None:
+            return pending[2][0]
+        return self.__array.shape[1] if self.__array is not None else self.__pil_image.width
 
     @property
     def height(self) -> int:
-        return self.array.shape[0] if self.array is not None else self.pil_image.height
+        pending = self.__resize
+        if pending is not None:
+            return pending[2][1]
+        return self.__array.shape[0] if self.__array is not None else self.__pil_image.height
+
+    def __array__(self, dtype: np.dtype = None, copy: bool = None) -> np.ndarray:
+        array = self.array if dtype is None else self.array.astype(dtype, copy=False)
+        return array.copy() if copy else array
+
+    def get_preview(self, max_side: int) -> "Image":
+        if self.__array is not None or self.__source is None or max(self.width, self.height) <= max_side:
+            return self
+
+        with PILImage.open(self.__source) as image:
+            width, height = image.size
+            if self.__get_orientation(image) in (5, 6, 7, 8):
+                width, height = height, width
+            if image.format != "JPEG" or (width, height) != (self.width, self.height):
+                return self
+            scale = max_side / max(image.width, image.height)
+            image.draft("RGB", (max(1, round(image.width * scale)), max(1, round(image.height * scale))))
+            return Image(self.__transpose(image.convert("RGB")))
+
+    def __init_state(self) -> None:
+        self.__array: np.ndarray = None
+        self.__pil_image: PILImage.Image = None
+        self.__source: str = None
+        self.__origin: Tuple["Image", Tuple[int, int, int, int]] = None
+        self.__resize: Tuple["Image", Tuple[int, int, int, int], Tuple[int, int], str, int, Callable] = None
+        self.__shared = False
+        self.__borrowed = False
+        self.__lock = threading.RLock()
+
+    def __get_shared_mode(self, array: np.ndarray) -> str:
+        if array.dtype != np.uint8 or not array.flags.c_contiguous:
+            return None
+        if array.ndim == 2:
+            return "L"
+        if array.ndim == 3 and array.shape[2] == 4:
+            return "RGBA"
+        return None
+
+    def __open(self, path: Union[str, os.PathLike]) -> PILImage.Image:
+        image = self.__transpose(PILImage.open(path))
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return image
+
+    def __transpose(self, image: PILImage.Image) -> PILImage.Image:
+        if self.__get_orientation(image) in (1, None):
+            return image
+        return ImageOps.exif_transpose(image)
+
+    def __get_orientation(self, image: PILImage.Image) -> int:
+        return image.getexif().get(0x0112)
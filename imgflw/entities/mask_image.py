@@ -0,0 +1,90 @@
+import threading
+from typing import Callable, Iterable, List, Tuple
+
+import numpy as np
+from PIL import Image as PILImage
+
+from imgflw.imaging import resampling
+
+from .image import Image
+
+
+class MaskImage(Image):
+    def __init__(self, width: int, height: int):
+        self.__width = width
+        self.__height = height
+        self.__tiles: List[Tuple[int, int, np.ndarray]] = []
+        self.__array: np.ndarray = None
+        self.__lock = threading.RLock()
+
+    @property
+    def array(self) -> np.ndarray:
+        with self.__lock:
+            if self.__array is None:
+                array = np.zeros((self.__height, self.__width), dtype=np.uint8)
+                for left, top, tile in self.__tiles:
+                    array[top : top + tile.shape[0], left : left + tile.shape[1]] = tile
+                self.__array = array
+                self.__tiles = []
+            return self.__array
+
+    @property
+    def mutable_array(self) -> np.ndarray:
+        return self.array
+
+    @property
+    def pil_image(self) -> PILImage.Image:
+        return PILImage.fromarray(self.array)
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    @property
+    def empty(self) -> bool:
+        return self.__array is None and len(self.__tiles) == 0
+
+    def copy(self) -> Image:
+        return Image(self.array.copy())
+
+    def get_preview(self, max_side: int) -> Image:
+        return self
+
+    def paste(self, left: int, top: int, tile: np.ndarray) -> None:
+        with self.__lock:
+            if self.__array is not None:
+                self.__array[top : top + tile.shape[0], left : left + tile.shape[1]] = tile
+            else:
+                self.__tiles.append((left, top, tile))
+
+    def resize(
+        self,
+        width: int,
+        height: int,
+        quality: str = resampling.BEST,
+        tiles: int = 1,
+        map_fn: Callable[[Callable, Iterable], Iterable] = map,
+    ) -> Image:
+        if self.empty:
+            return MaskImage(width, height)
+        return Image(self.array).resize(width, height, quality, tiles, map_fn)
+
+    def crop(self, box: Tuple[int, int, int, int]) -> "MaskImage":
+        left, top, right, bottom = box
+        cropped = MaskImage(right - left, bottom - top)
+        with self.__lock:
+            if self.__array is not None:
+                tiles = [(0, 0, self.__array)]
+            else:
+                tiles = self.__tiles
+
+            for tile_left, tile_top, tile in tiles:
+                l, t = max(left, tile_left), max(top, tile_top)
+                r, b = min(right, tile_left + tile.shape[1]), min(bottom, tile_top + tile.shape[0])
+                if r > l and b > t:
+                    cropped.paste(l - left, t - top, tile[t - tile_top : b - tile_top, l - tile_left : r - tile_left])
+        return cropped
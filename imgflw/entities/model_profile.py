@@ -0,0 +1,27 @@
+from typing import ClassVar, Dict, Optional
+
+from pydantic import BaseModel
+
+from . import default
+
+
+class ModelProfile(BaseModel):
+    steps: int = 20
+    guidance_scale: float = 0.7
+    scheduler: Optional[str] = None
+    dtype: str = "float16"
+    size: int = default.IMG2IMG_SIZE
+
+    profiles: ClassVar[Dict[str, "ModelProfile"]] = {}
+
+    @classmethod
+    def register(cls, model: str, profile: "ModelProfile") -> None:
+        cls.profiles[model] = profile
+
+    @classmethod
+    def get(cls, model: str) -> "ModelProfile":
+        return cls.profiles.get(model) or cls()
+
+
+ModelProfile.register("stabilityai/sd-turbo", ModelProfile(steps=2, guidance_scale=0.0, size=512))
+ModelProfile.register("stabilityai/sdxl-turbo", ModelProfile(steps=2, guidance_scale=0.0, size=512))
@@ -26,6 +26,7 @@ class Rect:
         tag: str = "face",
         landmarks: Landmarks = None,
         attributes: Dict[str, str] = {},
+        score: float = None,
     ) -> None:
         self.tag = tag
         self.left = left
@@ -39,6 +40,7 @@ class Rect:
         self.size = self.width * self.height
         self.landmarks = landmarks
         self.attributes = attributes
+        self.score = score
 
     @classmethod
     def from_ndarray(
@@ -49,11 +51,42 @@ class Rect:
         attributes: Dict[str, str] = {},
     ) -> "Rect":
         left, top, right, bottom, *_ = list(map(int, face_box))
-        return cls(left, top, right, bottom, tag, landmarks, attributes)
+        score = float(face_box[4]) if len(face_box) > 4 else None
+        return cls(left, top, right, bottom, tag, landmarks, attributes, score)
 
     def to_tuple(self) -> Tuple[int, int, int, int]:
         return self.left, self.top, self.right, self.bottom
 
+    def scale(self, ratio: float) -> "Rect":
+        landmarks = None
+        if self.landmarks is not None:
+            landmarks = Landmarks(*[Point(round(p.x * ratio), round(p.y * ratio)) for p in self.landmarks])
+        return Rect(
+            round(self.left * ratio),
+            round(self.top * ratio),
+            round(self.right * ratio),
+            round(self.bottom * ratio),
+            self.tag,
+            landmarks,
+            self.attributes,
+            self.score,
+        )
+
+    def translate(self, dx: int, dy: int) -> "Rect":
+        landmarks = None
+        if self.landmarks is not None:
+            landmarks = Landmarks(*[Point(p.x + dx, p.y + dy) for p in self.landmarks])
+        return Rect(
+            self.left + dx,
+            self.top + dy,
+            self.right + dx,
+            self.bottom + dy,
+            self.tag,
+            landmarks,
+            self.attributes,
+            self.score,
+        )
+
     def to_square(self):
         left, top, right, bottom = self.to_tuple()
 
@@ -0,0 +1,57 @@
+import math
+from typing import Callable, Iterable, List, Tuple
+
+import cv2
+import numpy as np
+
+BOX_BLUR_MIN_SIGMA = 8.0
+BOX_BLUR_PASSES = 3
+MIN_TILE_ROWS = 128
+
+
+def gaussian_blur(
+    image: np.ndarray, sigma: float, tiles: int = 1, map_fn: Callable[[Callable, Iterable], Iterable] = map
+) -> np.ndarray:
+    if sigma <= 0:
+        return image.copy()
+
+    if sigma < BOX_BLUR_MIN_SIGMA:
+        ksize = 2 * math.ceil(3 * sigma) + 1
+        halo = ksize // 2
+
+        def blur(array: np.ndarray) -> np.ndarray:
+            return cv2.GaussianBlur(array, (ksize, ksize), sigma, borderType=cv2.BORDER_REPLICATE)
+
+    else:
+        sizes = get_box_sizes(sigma, BOX_BLUR_PASSES)
+        halo = sum(size // 2 for size in sizes)
+
+        def blur(array: np.ndarray) -> np.ndarray:
+            for size in sizes:
+                array = cv2.blur(array, (size, size), borderType=cv2.BORDER_REPLICATE)
+            return array
+
+    tiles = min(tiles, image.shape[0] // MIN_TILE_ROWS)
+    if tiles <= 1:
+        return blur(image)
+
+    height = image.shape[0]
+    bounds = [(height * i // tiles, height * (i + 1) // tiles) for i in range(tiles)]
+    output = np.empty_like(image)
+
+    def blur_tile(bound: Tuple[int, int]) -> None:
+        top, bottom = bound
+        start, end = max(0, top - halo), min(height, bottom + halo)
+        output[top:bottom] = blur(image[start:end])[top - start : bottom - start]
+
+    list(map_fn(blur_tile, bounds))
+    return output
+
+
+def get_box_sizes(sigma: float, passes: int) -> List[int]:
+    ideal = math.sqrt(12 * sigma * sigma / passes + 1)
+    lower = int(ideal)
+    lower = lower - 1 if lower % 2 == 0 else lower
+    upper = lower + 2
+    count = round((12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes) / (-4 * lower - 4))
+    return [lower if i < count else upper for i in range(passes)]
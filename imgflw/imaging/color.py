@@ -0,0 +1,96 @@
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+__VALUES = np.arange(256, dtype=np.float64)
+
+
+class ColorTransform:
+    RGB = "rgb"
+    HLS = "hls"
+    CONTRAST = "contrast"
+
+    def __init__(self, stages: List[Tuple[str, object]] = None):
+        self.stages = stages or []
+
+    @classmethod
+    def rgb(cls, red: float = 1.0, green: float = 1.0, blue: float = 1.0) -> "ColorTransform":
+        return cls([(cls.RGB, np.stack([scale_lut(red), scale_lut(green), scale_lut(blue)], axis=1))])
+
+    @classmethod
+    def hls(cls, hue: int = 0, lightness: float = 1.0, saturation: float = 1.0) -> "ColorTransform":
+        return cls([(cls.HLS, np.stack([hue_lut(hue), scale_lut(lightness), scale_lut(saturation)], axis=1))])
+
+    @classmethod
+    def contrast(cls, contrast: float = 1.0) -> "ColorTransform":
+        return cls([(cls.CONTRAST, contrast)])
+
+    def then(self, other: "ColorTransform") -> "ColorTransform":
+        stages = list(self.stages)
+        for kind, value in other.stages:
+            if kind == self.RGB and len(stages) > 0 and stages[-1][0] == self.RGB:
+                stages[-1] = (self.RGB, compose(stages[-1][1], value))
+            else:
+                stages.append((kind, value))
+        return ColorTransform(stages)
+
+    def apply(self, image: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        current = image
+        pending: np.ndarray = None
+        histograms: List[np.ndarray] = None
+
+        for kind, value in self.stages:
+            if kind == self.RGB:
+                pending = value if pending is None else compose(pending, value)
+            elif kind == self.CONTRAST:
+                if histograms is None:
+                    histograms = [cv2.calcHist([current], [c], None, [256], [0, 256])[:, 0] for c in range(3)]
+                lut = contrast_lut(value, get_mean_luma(histograms, pending))
+                pending = lut if pending is None else compose(pending, lut)
+            else:
+                if pending is not None:
+                    current = apply_lut(current, pending, out)
+                    pending = None
+                hls = cv2.cvtColor(current, cv2.COLOR_RGB2HLS)
+                cv2.LUT(hls, value.reshape(1, 256, 3), dst=hls)
+                current = cv2.cvtColor(hls, cv2.COLOR_HLS2RGB, dst=out)
+                histograms = None
+
+        if pending is not None:
+            return apply_lut(current, pending, out)
+        if current is image and out is not None:
+            out[...] = image
+            return out
+        return current
+
+
+def scale_lut(factor: float) -> np.ndarray:
+    return np.clip(__VALUES * factor, 0, 255).astype(np.uint8)
+
+
+def hue_lut(hue: int) -> np.ndarray:
+    return np.mod(__VALUES + hue / 360 * 180, 180).astype(np.uint8)
+
+
+def contrast_lut(factor: float, mean: float) -> np.ndarray:
+    mean = np.float32(int(mean + 0.5))
+    lut = np.clip(mean + np.float32(factor) * (__VALUES.astype(np.float32) - mean), 0, 255).astype(np.uint8)
+    return np.repeat(lut[:, np.newaxis], 3, axis=1)
+
+
+def compose(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    return np.stack([second[first[:, c], c] for c in range(first.shape[1])], axis=1)
+
+
+def apply_lut(image: np.ndarray, lut: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    return cv2.LUT(image, lut.reshape(1, 256, 3), dst=out)
+
+
+def get_mean_luma(histograms: List[np.ndarray], lut: np.ndarray = None) -> float:
+    mean = 0.0
+    for c, histogram in enumerate(histograms):
+        values = __VALUES if lut is None else lut[:, c].astype(np.float64)
+        mean += LUMA_WEIGHTS[c] * float(np.dot(histogram, values) / max(histogram.sum(), 1))
+    return mean
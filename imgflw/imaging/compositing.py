@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+
+
+def blend(foreground: np.ndarray, background: np.ndarray, mask: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    mask = __broadcastable(mask, foreground)
+    value = foreground.astype(np.uint16)
+    value *= mask
+    inverse = background.astype(np.uint16)
+    inverse *= 255 - mask
+    value += inverse
+    return __divide_by_255(value, out)
+
+
+def apply_mask(image: np.ndarray, mask: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    value = image.astype(np.uint16)
+    value *= __broadcastable(mask, image)
+    return __divide_by_255(value, out)
+
+
+def to_gray_mask(mask: np.ndarray) -> np.ndarray:
+    if mask.ndim == 2:
+        return mask
+    if mask.shape[2] == 1:
+        return mask[..., 0]
+    if mask.shape[2] == 4:
+        return cv2.cvtColor(mask, cv2.COLOR_RGBA2GRAY)
+    return cv2.cvtColor(mask, cv2.COLOR_RGB2GRAY)
+
+
+def __broadcastable(mask: np.ndarray, image: np.ndarray) -> np.ndarray:
+    if mask.ndim < image.ndim:
+        mask = mask[..., np.newaxis]
+    return mask.astype(np.uint8, copy=False)
+
+
+def __divide_by_255(value: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    value += 128
+    value += value >> 8
+    value >>= 8
+    if out is None:
+        return value.astype(np.uint8)
+    out[...] = value
+    return out
@@ -0,0 +1,54 @@
+from typing import Callable, Iterable, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image as PILImage
+
+FAST = "fast"
+BALANCED = "balanced"
+BEST = "best"
+PRE_REDUCE_RATIO = 2
+MIN_TILE_ROWS = 64
+
+__UPSCALE_INTERPOLATIONS = {FAST: cv2.INTER_LINEAR, BALANCED: cv2.INTER_CUBIC, BEST: cv2.INTER_LANCZOS4}
+__DOWNSCALE_FILTERS = {BALANCED: PILImage.BICUBIC, BEST: PILImage.LANCZOS}
+
+
+def resize(
+    image: np.ndarray,
+    width: int,
+    height: int,
+    quality: str = BALANCED,
+    tiles: int = 1,
+    map_fn: Callable[[Callable, Iterable], Iterable] = map,
+) -> np.ndarray:
+    current_height, current_width = image.shape[:2]
+    if current_width == width and current_height == height:
+        return image.copy()
+
+    if width > current_width or height > current_height:
+        return cv2.resize(image, (width, height), interpolation=__UPSCALE_INTERPOLATIONS[quality])
+
+    if quality == FAST:
+        return cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+    resample = __DOWNSCALE_FILTERS[quality]
+    if current_width > width * PRE_REDUCE_RATIO and current_height > height * PRE_REDUCE_RATIO:
+        size = (width * PRE_REDUCE_RATIO, height * PRE_REDUCE_RATIO)
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    source = PILImage.fromarray(np.ascontiguousarray(image))
+    tiles = min(tiles, height // MIN_TILE_ROWS)
+    if tiles <= 1:
+        return np.array(source.resize((width, height), resample=resample))
+
+    scale = source.height / height
+    output = np.empty((height, width) + image.shape[2:], dtype=np.uint8)
+
+    def resize_tile(bound: Tuple[int, int]) -> None:
+        top, bottom = bound
+        box = (0, top * scale, source.width, bottom * scale)
+        output[top:bottom] = np.array(source.resize((width, bottom - top), resample=resample, box=box))
+
+    list(map_fn(resize_tile, [(height * i // tiles, height * (i + 1) // tiles) for i in range(tiles)]))
+    return output
@@ -154,7 +154,7 @@ class UIBuilder:
             prompt=Settings.get("prompt"),
             negative_prompt=Settings.get("negative_prompt"),
             use_minimal_area=Settings.get("use_minimal_area", False),
-            img2img_size=Settings.get("img2img_size", default.IMG2IMG_SIZE),
+            img2img_size=Settings.get("img2img_size", None),
         )
 
         img = image
@@ -318,7 +318,7 @@ class UIBuilder:
                         img2img_size = gr.Dropdown(
                             label="Img2img size",
                             choices=[512, 1024],
-                            value=Settings.get("img2img_size", default.IMG2IMG_SIZE),
+                            value=Settings.get("img2img_size", None),
                         )
                 with gr.Row():
                     save_settings_button = gr.Button(value="💾 Save", scale=0, size="lg", variant="primary")
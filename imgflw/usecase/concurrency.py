@@ -0,0 +1,42 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, TypeVar
+
+from imgflw.usecase.settings import Settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+__executor: ThreadPoolExecutor = None
+__executor_lock = threading.Lock()
+__worker = threading.local()
+
+
+def max_workers() -> int:
+    return max(1, int(Settings.get("max_workers", None) or os.cpu_count() or 1))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global __executor
+    with __executor_lock:
+        if __executor is None:
+            __executor = ThreadPoolExecutor(
+                max_workers=max_workers(), thread_name_prefix="imgflw", initializer=__mark_worker
+            )
+        return __executor
+
+
+def is_worker() -> bool:
+    return getattr(__worker, "active", False)
+
+
+def run_concurrently(fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    items = list(items)
+    if len(items) <= 1 or is_worker() or max_workers() <= 1:
+        return [fn(item) for item in items]
+    return list(get_executor().map(fn, items))
+
+
+def __mark_worker() -> None:
+    __worker.active = True
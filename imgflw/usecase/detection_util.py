@@ -0,0 +1,75 @@
+from typing import Callable, List, Tuple
+
+from imgflw.entities import Image, Rect
+from imgflw.imaging import resampling
+
+Detect = Callable[[Image], List[Rect]]
+
+
+def detect(
+    image: Image, detect_fn: Detect, max_detection_side: int = 0, refine: bool = False, refine_margin: float = 1.0
+) -> List[Rect]:
+    small, ratio = fit(image, max_detection_side)
+    if ratio == 1.0:
+        return detect_fn(image)
+
+    faces = [face.scale(ratio) for face in detect_fn(small)]
+    if refine:
+        faces = [__refine(image, face, detect_fn, max_detection_side, refine_margin) for face in faces]
+    return faces
+
+
+def fit(image: Image, max_side: int) -> Tuple[Image, float]:
+    if max_side <= 0 or max(image.width, image.height) <= max_side:
+        return image, 1.0
+
+    small = image.get_preview(max_side)
+    scale = max_side / max(small.width, small.height)
+    if scale < 1:
+        width = max(1, round(small.width * scale))
+        height = max(1, round(small.height * scale))
+        small = Image(resampling.resize(small.array, width, height, resampling.FAST))
+    return small, image.width / small.width
+
+
+def iou(a: Rect, b: Rect) -> float:
+    width = min(a.right, b.right) - max(a.left, b.left)
+    height = min(a.bottom, b.bottom) - max(a.top, b.top)
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    return intersection / (a.size + b.size - intersection)
+
+
+def pad(face: Rect, margin: float, width: int, height: int) -> Tuple[int, int, int, int]:
+    dx = round(face.width * margin)
+    dy = round(face.height * margin)
+    return max(0, face.left - dx), max(0, face.top - dy), min(width, face.right + dx), min(height, face.bottom + dy)
+
+
+def fuse(faces: List[Rect], iou_threshold: float) -> List[Rect]:
+    candidates = sorted(faces, key=lambda f: (f.landmarks is not None, f.score or 0.0, f.size), reverse=True)
+    kept: List[Rect] = []
+    for face in candidates:
+        if all(not __is_duplicate(face, k, iou_threshold) for k in kept):
+            kept.append(face)
+    return kept
+
+
+def __refine(image: Image, face: Rect, detect_fn: Detect, max_detection_side: int, margin: float) -> Rect:
+    left, top, right, bottom = pad(face, margin, image.width, image.height)
+    if right - left <= 0 or bottom - top <= 0:
+        return face
+
+    crop, ratio = fit(Image(image.array[top:bottom, left:right]), max_detection_side)
+    candidates = [c.scale(ratio).translate(left, top) for c in detect_fn(crop)]
+    candidates = [c for c in candidates if iou(c, face) > 0]
+    if len(candidates) == 0:
+        return face
+    return max(candidates, key=lambda c: iou(c, face))
+
+
+def __is_duplicate(face: Rect, other: Rect, iou_threshold: float) -> bool:
+    if (face.tag or "").lower() != (other.tag or "").lower():
+        return False
+    return iou(face, other) > iou_threshold
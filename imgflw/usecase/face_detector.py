@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from imgflw.entities import Image, Rect
+from imgflw.usecase import concurrency
 
 
 class FaceDetector(ABC):
@@ -12,3 +13,6 @@ class FaceDetector(ABC):
     @abstractmethod
     def detect(self, image: Image, **kwargs) -> List[Rect]:
         pass
+
+    def detect_batch(self, images: List[Image], **kwargs) -> List[List[Rect]]:
+        return concurrency.run_concurrently(lambda image: self.detect(image, **kwargs), images)
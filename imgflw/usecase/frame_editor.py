@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List, Tuple
 
 from imgflw.entities import DebugImage, Image, Rect
+from imgflw.imaging.color import ColorTransform
 
 
 class FrameEditor(ABC):
@@ -14,3 +15,11 @@ class FrameEditor(ABC):
         self, image: Image, mask_image: Image, faces: List[Rect], intermediate_steps: List[DebugImage], **kwargs
     ) -> Tuple[Image, Image]:
         pass
+
+    def edit_in_place(
+        self, image: Image, mask_image: Image, faces: List[Rect], intermediate_steps: List[DebugImage], **kwargs
+    ) -> Tuple[Image, Image]:
+        return self.edit(image, mask_image, faces, intermediate_steps, **kwargs)
+
+    def get_color_transform(self, **kwargs) -> ColorTransform:
+        return None
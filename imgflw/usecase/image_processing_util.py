@@ -1,19 +1,62 @@
+import threading
+from typing import Tuple
+
 import cv2
-from PIL import Image as PILImage
+import numpy as np
 
-from imgflw.entities import Image
+from imgflw.entities import Image, MaskImage
+from imgflw.imaging import resampling
+from imgflw.usecase import Settings
 from imgflw.usecase import component_registry as registry
+from imgflw.usecase import concurrency
 
+__upscaler_lock = threading.Lock()
 
-def rotate(image: Image, angle: float) -> Image:
-    if angle == 0:
-        return image
 
-    h, w = image.array.shape[:2]
-    center = (w // 2, h // 2)
+def get_alignment(
+    width: int, height: int, angle: float, aligned_width: int, aligned_height: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    center = ((width - 1) / 2, (height - 1) / 2)
+    aligned_center = ((aligned_width - 1) / 2, (aligned_height - 1) / 2)
+    scale = np.array([[aligned_width / width], [aligned_height / height]])
+
+    matrix = cv2.getRotationMatrix2D(center, angle, 1.0) * scale
+    matrix[:, 2] += np.array(aligned_center) - scale[:, 0] * center
+    return matrix, cv2.invertAffineTransform(matrix)
+
+
+def align(image: Image, angle: float, width: int, height: int = None, upscaler: str = None) -> Tuple[Image, np.ndarray]:
+    if height is None:
+        height = round(image.height * width / image.width)
 
-    m = cv2.getRotationMatrix2D(center, angle, 1.0)
-    return Image(cv2.warpAffine(image.array, m, (w, h)))
+    source = image
+    scale = width / image.width
+    if scale > 1 and upscaler:
+        source = upscale(image, width, height, upscaler)
+    elif scale < 0.5:
+        size = (max(1, round(image.width * scale * 2)), max(1, round(image.height * scale * 2)))
+        source = Image(resampling.resize(image.array, size[0], size[1], resampling.FAST))
+
+    matrix, _ = get_alignment(source.width, source.height, angle, width, height)
+    _, inverse = get_alignment(image.width, image.height, angle, width, height)
+    return warp(source, matrix, width, height), inverse
+
+
+def warp(image: Image, matrix: np.ndarray, width: int, height: int) -> Image:
+    scale = np.sqrt(abs(np.linalg.det(matrix[:, :2])))
+    warped_width, warped_height = width, height
+    if scale < 1:
+        warped_width, warped_height = max(width, round(width / scale)), max(height, round(height / scale))
+        factor = np.array([[warped_width / width], [warped_height / height]])
+        matrix = matrix * factor
+        matrix[:, 2] += (factor[:, 0] - 1) / 2
+
+    warped = cv2.warpAffine(
+        image.array, matrix, (warped_width, warped_height), flags=cv2.INTER_LANCZOS4, borderMode=cv2.BORDER_REFLECT_101
+    )
+    if warped_width == width and warped_height == height:
+        return Image(warped)
+    return Image(resampling.resize(warped, width, height, get_resampling_quality()))
 
 
 def resize(image: Image, width: int, height: int = None, upscaler: str = None) -> Image:
@@ -31,13 +74,18 @@ def resize(image: Image, width: int, height: int = None, upscaler: str = None) -
 
 
 def downscale(image: Image, width: int, height: int) -> Image:
-    return Image(image.pil_image.resize((width, height), resample=PILImage.LANCZOS))
+    return image.resize(
+        width, height, get_resampling_quality(), tiles=concurrency.max_workers(), map_fn=concurrency.run_concurrently
+    )
 
 
 def upscale(image: Image, width: int, height: int, upscaler_name: str = None) -> Image:
     width = int(width // 8 * 8)
     height = int(height // 8 * 8)
 
+    if isinstance(image, MaskImage) and image.empty:
+        return MaskImage(width, height)
+
     if upscaler_name:
         upscaler = registry.get_upscaler(upscaler_name)
 
@@ -47,12 +95,16 @@ def upscale(image: Image, width: int, height: int, upscaler_name: str = None) ->
 
             original_size = (image.width, image.height)
 
-            image = upscaler.upscale(image)
+            with __upscaler_lock:
+                image = upscaler.upscale(image)
 
             if original_size == (image.width, image.height):
                 break
 
-    if image.width != width or image.height != height:
-        image = image.pil_image.resize((width, height), resample=PILImage.LANCZOS)
+    return image.resize(
+        width, height, get_resampling_quality(), tiles=concurrency.max_workers(), map_fn=concurrency.run_concurrently
+    )
+
 
-    return Image(image)
+def get_resampling_quality() -> str:
+    return Settings.get("resampling_quality", None) or resampling.BEST
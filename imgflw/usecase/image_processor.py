@@ -1,12 +1,31 @@
+import os
 from operator import attrgetter
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
 from PIL import Image as PILImage
 
-from imgflw.entities import Config, DebugImage, Face, Image, Job, Rect, Rule, Status, Worker, Workflow
+from imgflw.entities import (
+    Canvas,
+    Config,
+    DebugImage,
+    Face,
+    FaceArtifacts,
+    Image,
+    Job,
+    MaskImage,
+    ModelProfile,
+    Rect,
+    Rule,
+    Status,
+    Worker,
+    Workflow,
+)
+from imgflw.imaging import compositing
+from imgflw.imaging.color import ColorTransform
+from imgflw.usecase import FrameEditor, MaskGenerator
 from imgflw.usecase import component_registry as registry
-from imgflw.usecase import condition_matcher, query_matcher
+from imgflw.usecase import concurrency, condition_matcher, detection_util, query_matcher
 
 
 class ImageProcessor:
@@ -18,7 +37,7 @@ class ImageProcessor:
 
     def process(
         self,
-        image: Union[np.ndarray, PILImage.Image, Image],
+        image: Union[np.ndarray, PILImage.Image, Image, str, os.PathLike],
         workflow: Union[Workflow, str],
         config: Union[Workflow, str],
         status: Status,
@@ -28,48 +47,69 @@ class ImageProcessor:
         if isinstance(config, str):
             config: Config = Config.model_validate_json(config)
 
+        source = image if isinstance(image, (np.ndarray, Image)) else None
         image = Image(image)
-        mask_image = Image(np.zeros_like(image.array))
+        mask_image = MaskImage(image.width, image.height)
         status.intermediate_steps: List[DebugImage] = [] if config.show_intermediate_steps else None
         faces = self.__detect_faces(workflow, image, config, status)
 
         if self.__has_preprocessors(workflow):
-            image, mask_image = self.__preprocess(workflow, image, mask_image, faces, config, status)
+            image, mask_image = self.__preprocess(workflow, image, mask_image, faces, config, status, source)
             faces = self.__detect_faces(workflow, image, config, status)
 
-        for i, _ in enumerate(faces):
-            if status.canceled:
-                return image
+        artifacts = [FaceArtifacts() for _ in faces]
+        self.__prepare_masks(workflow, image, faces, artifacts, config)
+
+        canvas = Canvas(image if self.__owns(image, source) else image.copy())
+        debug_images: List[List[DebugImage]] = [[] for _ in faces]
+
+        def process_faces(indexes: List[int]) -> None:
+            for i in indexes:
+                if status.canceled:
+                    return
+                self.__process_face_area(
+                    workflow, canvas, mask_image, faces, i, artifacts[i], config, status, debug_images[i]
+                )
 
-            image, mask_image = self.__process_face_area(workflow, image, mask_image, faces, i, config, status)
+        if config.concurrent_face_processing:
+            concurrency.run_concurrently(process_faces, self.__group_overlapping_faces(faces, canvas, config))
+        else:
+            process_faces(list(range(len(faces))))
+        image = canvas.flush()
+
+        if status.intermediate_steps is not None:
+            for images in debug_images:
+                status.intermediate_steps.extend(images)
 
         if status.canceled:
             return image
 
         if self.__has_postprocessors(workflow):
-            image, mask_image = self.__postprocess(workflow, image, mask_image, faces, config, status)
+            image, mask_image = self.__postprocess(workflow, image, mask_image, faces, config, status, source)
 
         return image
 
     def __process_face_area(
         self,
         workflow: Workflow,
-        entire_image: Image,
+        canvas: Canvas,
         entire_mask_image: Image,
         face_areas: List[Rect],
         index: int,
+        artifacts: FaceArtifacts,
         config: Config,
         status: Status,
-    ) -> Tuple[Image, Image]:
-        rule = self.__select_rule(workflow, face_areas, index, entire_image.width, entire_image.height)
+        debug_images: List[DebugImage],
+    ) -> None:
+        rule = self.__select_rule(workflow, face_areas, index, canvas.width, canvas.height)
         if rule is None or len(rule.then) == 0:
-            return entire_image, entire_mask_image
+            return
 
         face_area = face_areas[index]
-        face = Face(entire_image, face_area, config.face_margin)
+        face = Face(canvas, face_area, config.face_margin, artifacts)
         for job in rule.then:
             if status.canceled:
-                return entire_image, entire_mask_image
+                return
 
             face_intermediate_steps: List[DebugImage] = [] if status.intermediate_steps is not None else None
             if face_intermediate_steps is not None:
@@ -77,17 +117,28 @@ class ImageProcessor:
 
             self.__process_face(job, face, config, face_intermediate_steps)
             self.__generate_mask(job, face, config, face_intermediate_steps)
-            entire_image, entire_mask_image = face.merge(entire_image, entire_mask_image, config.use_minimal_area)
+            face.merge(canvas, entire_mask_image, config.use_minimal_area)
 
             if status.intermediate_steps is not None:
-                face_image = Face(entire_image, face_area, config.face_margin).face_image.copy()
+                face_image = canvas.crop((face.left, face.top, face.right, face.bottom)).copy()
                 face_intermediate_steps.append(DebugImage(face_image))
-                status.intermediate_steps.append(self.__create_debug_image_for_face(face_intermediate_steps, config))
-        return entire_image, entire_mask_image
+                debug_images.append(self.__create_debug_image_for_face(face_intermediate_steps, config))
+
+    def __group_overlapping_faces(self, face_areas: List[Rect], canvas: Canvas, config: Config) -> List[List[int]]:
+        boxes = [Face.get_box(face_area, config.face_margin, canvas.width, canvas.height) for face_area in face_areas]
+        groups: List[List[int]] = []
+        for index, box in enumerate(boxes):
+            overlapping = [g for g in groups if any(self.__overlaps(box, boxes[i]) for i in g)]
+            merged = sorted([index] + [i for g in overlapping for i in g])
+            groups = [g for g in groups if g not in overlapping] + [merged]
+        return sorted(groups, key=lambda g: g[0])
+
+    def __overlaps(self, a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+        return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
 
     def __create_debug_image_for_face(self, face_intermediate_steps: List[DebugImage], config: Config) -> DebugImage:
-        img = np.zeros((config.img2img_size * 2, config.img2img_size * 2, 3), dtype=np.uint8)
-        size = config.img2img_size
+        size = config.img2img_size or ModelProfile.get(config.model).size
+        img = np.zeros((size * 2, size * 2, 3), dtype=np.uint8)
 
         img[0:size, 0:size] = face_intermediate_steps[0].get_image(size).array
         if len(face_intermediate_steps) > 1:
@@ -111,6 +162,35 @@ class ImageProcessor:
         face_image = face.face_image.copy()
         return DebugImage(face_image, top_message=top_message, bottom_message=bottom_message)
 
+    def __prepare_masks(
+        self,
+        workflow: Workflow,
+        entire_image: Image,
+        face_areas: List[Rect],
+        artifacts: List[FaceArtifacts],
+        config: Config,
+    ) -> None:
+        targets: Dict[str, Tuple[Worker, List[Face]]] = {}
+        for index, face_area in enumerate(face_areas):
+            rule = self.__select_rule(workflow, face_areas, index, entire_image.width, entire_image.height)
+            if rule is None:
+                continue
+
+            face = None
+            for job in rule.then:
+                mg = job.mask_generator
+                if type(registry.get_mask_generator(mg.name)).prepare is MaskGenerator.prepare:
+                    continue
+                _, faces = targets.setdefault(mg.name.lower(), (mg, []))
+                face = face if face is not None else Face(entire_image, face_area, config.face_margin, artifacts[index])
+                if face not in faces:
+                    faces.append(face)
+
+        for name, (mg, faces) in targets.items():
+            params = config.model_dump().copy()
+            params.update(mg.params)
+            registry.get_mask_generator(name).prepare(faces, **params)
+
     def __generate_mask(self, job: Job, face: Face, config: Config, intermediate_steps: List[DebugImage]) -> None:
         mg = job.mask_generator
         mask_generator = registry.get_mask_generator(mg.name)
@@ -172,13 +252,12 @@ class ImageProcessor:
                 raise KeyError(f"frame_editor `{frame_editor.name}` does not exist")
 
     def __detect_faces(self, workflow: Workflow, image: Image, config: Config, status: Status) -> List[Rect]:
-        results = []
-
-        for fd in workflow.face_detectors:
-            face_detector = registry.get_face_detector(fd.name)
-            params = config.model_dump().copy()
-            params.update(fd.params)
-            results.extend(face_detector.detect(image, **params))
+        detected = concurrency.run_concurrently(
+            lambda fd: self.__run_face_detector(fd, image, config), workflow.face_detectors
+        )
+        results = [face for faces in detected for face in faces]
+        if len(workflow.face_detectors) > 1:
+            results = detection_util.fuse(results, config.face_fusion_iou)
 
         faces = sorted(results, key=attrgetter("height"), reverse=True)
         faces = faces[: config.max_face_count]
@@ -190,6 +269,12 @@ class ImageProcessor:
 
         return faces
 
+    def __run_face_detector(self, fd: Worker, image: Image, config: Config) -> List[Rect]:
+        face_detector = registry.get_face_detector(fd.name)
+        params = config.model_dump().copy()
+        params.update(fd.params)
+        return face_detector.detect(image, **params)
+
     def __has_preprocessors(self, workflow: Workflow) -> bool:
         return workflow.preprocessors is not None and len(workflow.preprocessors) > 0
 
@@ -197,20 +282,34 @@ class ImageProcessor:
         return workflow.postprocessors is not None and len(workflow.postprocessors) > 0
 
     def __preprocess(
-        self, workflow: Workflow, image: Image, mask_image: Image, config: Config, faces: List[Rect], status: Status
+        self,
+        workflow: Workflow,
+        image: Image,
+        mask_image: Image,
+        config: Config,
+        faces: List[Rect],
+        status: Status,
+        source: Union[np.ndarray, Image],
     ) -> Tuple[Image, Image]:
         if workflow.preprocessors is None:
             return image, mask_image
 
-        return self.__edit(workflow.preprocessors, image, mask_image, config, faces, status)
+        return self.__edit(workflow.preprocessors, image, mask_image, config, faces, status, source)
 
     def __postprocess(
-        self, workflow: Workflow, image: Image, mask_image: Image, faces: List[Rect], config: Config, status: Status
+        self,
+        workflow: Workflow,
+        image: Image,
+        mask_image: Image,
+        faces: List[Rect],
+        config: Config,
+        status: Status,
+        source: Union[np.ndarray, Image],
     ) -> Tuple[Image, Image]:
         if workflow.postprocessors is None:
             return image, mask_image
 
-        return self.__edit(workflow.postprocessors, image, mask_image, faces, config, status)
+        return self.__edit(workflow.postprocessors, image, mask_image, faces, config, status, source)
 
     def __edit(
         self,
@@ -220,13 +319,63 @@ class ImageProcessor:
         faces: List[Rect],
         config: Config,
         status: Status,
+        source: Union[np.ndarray, Image],
     ) -> Tuple[Image, Image]:
-        for fe in frame_editors:
+        index = 0
+        while index < len(frame_editors):
             if status.canceled:
                 return image
+
+            transforms = self.__get_color_transforms(frame_editors[index:], config)
+            if len(transforms) > 1:
+                image = self.__apply_color_transforms(transforms, image, status, self.__owns(image, source))
+                index += len(transforms)
+                continue
+
+            fe = frame_editors[index]
+            index += 1
             print(f"frame_editor: {fe.name}", flush=True)
             frame_editor = registry.get_frame_editor(fe.name)
             params = config.model_dump().copy()
             params.update(fe.params)
-            image, mask_image = frame_editor.edit(image, mask_image, faces, status.intermediate_steps, **params)
+            if type(frame_editor).edit_in_place is not FrameEditor.edit_in_place and self.__owns(image, source):
+                edit = frame_editor.edit_in_place
+            else:
+                edit = frame_editor.edit
+            image, mask_image = edit(image, mask_image, faces, status.intermediate_steps, **params)
+            if mask_image is not None and not isinstance(mask_image, MaskImage) and mask_image.array.ndim != 2:
+                mask_image = Image(compositing.to_gray_mask(mask_image.array))
         return image, mask_image
+
+    def __owns(self, image: Image, source: Union[np.ndarray, Image]) -> bool:
+        if source is None:
+            return True
+        source = source.array if isinstance(source, Image) else source
+        return image.array.flags.writeable and not np.may_share_memory(image.array, source)
+
+    def __get_color_transforms(
+        self, frame_editors: List[Worker], config: Config
+    ) -> List[Tuple[Worker, ColorTransform]]:
+        transforms = []
+        for fe in frame_editors:
+            params = config.model_dump().copy()
+            params.update(fe.params)
+            transform = registry.get_frame_editor(fe.name).get_color_transform(**params)
+            if transform is None:
+                break
+            transforms.append((fe, transform))
+        return transforms
+
+    def __apply_color_transforms(
+        self, transforms: List[Tuple[Worker, ColorTransform]], image: Image, status: Status, in_place: bool
+    ) -> Image:
+        names = [fe.name for fe, _ in transforms]
+        print(f"frame_editor: {' + '.join(names)}", flush=True)
+        fused = ColorTransform()
+        for _, transform in transforms:
+            fused = fused.then(transform)
+        image = Image(fused.apply(image.array, out=image.mutable_array if in_place else None))
+
+        if status.intermediate_steps is not None:
+            status.intermediate_steps.append(DebugImage(image, bottom_message=" + ".join(names)))
+        return image
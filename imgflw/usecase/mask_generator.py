@@ -4,6 +4,7 @@ from typing import List
 import numpy as np
 
 from imgflw.entities import DebugImage, Face
+from imgflw.imaging import compositing
 
 
 class MaskGenerator(ABC):
@@ -15,6 +16,9 @@ class MaskGenerator(ABC):
     def generate_mask(self, face: Face, intermediate_steps: List[DebugImage], **kwargs) -> None:
         pass
 
+    def prepare(self, faces: List[Face], **kwargs) -> None:
+        pass
+
     def add_debug_image(self, face: Face, intermediate_steps: List[DebugImage], top_message: str = None) -> None:
         mask = face.mask_image.array
         masked_image = self.to_masked_image(mask, face.face_image.array)
@@ -25,5 +29,4 @@ class MaskGenerator(ABC):
 
     @staticmethod
     def to_masked_image(mask_image: np.ndarray, image: np.ndarray) -> np.ndarray:
-        gray_mask = mask_image / 255.0
-        return (image * gray_mask).astype("uint8")
+        return compositing.apply_mask(image, mask_image)